@@ -5,14 +5,93 @@ Utility functions for making API requests to external services.
 import json
 import logging
 import random
-import time
+import socket
 from typing import Dict, Any, Optional, List, Union
 
 import urllib3
+from urllib3.connection import HTTPConnection
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib json module
+    orjson = None
 
 # Configure logging
 logger = logging.getLogger()
 
+# Backoff for retrying requests: full jitter over an exponentially growing window
+RETRY_BACKOFF_BASE = 0.1  # seconds
+RETRY_BACKOFF_CAP = 8.0  # seconds
+
+
+class JitteredRetry(urllib3.Retry):
+    """urllib3 retry policy that applies full jitter to its capped exponential backoff."""
+    
+    def get_backoff_time(self) -> float:
+        """
+        Get the time to sleep before the next retry.
+        
+        Returns:
+            A random fraction of the exponential backoff, capped at RETRY_BACKOFF_CAP
+        """
+        return min(RETRY_BACKOFF_CAP, super().get_backoff_time()) * random.random()
+
+
+# Retry policy for Nile API requests: up to 3 connection and 3 read errors, and up
+# to 5 responses with a retryable status, including 401s. Once retries run out the
+# last response is returned rather than raised, so make_request can report it.
+RETRY_POLICY = JitteredRetry(
+    total=8,
+    connect=3,
+    read=3,
+    status=5,
+    status_forcelist=(401, 429, 500, 502, 503, 504),
+    allowed_methods=frozenset(['GET']),
+    backoff_factor=RETRY_BACKOFF_BASE,
+    respect_retry_after_header=True,
+    raise_on_status=False
+)
+
+# Nile API host
+NILE_API_HOST = "u1.nile-global.cloud"
+
+# TCP keepalive for pooled sockets, so idle connections to the Nile API are probed
+# rather than silently dropped by middleboxes. The tuning options are Linux-specific
+# and skipped where the platform doesn't provide them.
+KEEPALIVE_SOCKET_OPTIONS = HTTPConnection.default_socket_options + [
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+] + [
+    (socket.IPPROTO_TCP, getattr(socket, name), value)
+    for name, value in (('TCP_KEEPIDLE', 30), ('TCP_KEEPINTVL', 15), ('TCP_KEEPCNT', 4))
+    if hasattr(socket, name)
+]
+
+# Shared connection pool, kept across warm invocations so keep-alive connections
+# to the Nile API are reused. Every request goes to the same host, so a single
+# host pool skips the per-request URL parsing and pool lookup of a PoolManager.
+# Sized for the concurrent tenant update requests.
+HTTP_POOL = urllib3.HTTPSConnectionPool(
+    NILE_API_HOST,
+    port=443,
+    maxsize=8,
+    socket_options=KEEPALIVE_SOCKET_OPTIONS
+)
+
+def json_loads(data: Union[str, bytes]) -> Any:
+    """
+    Parse a JSON document, using orjson when it is available.
+    
+    Args:
+        data: The JSON document as a str or bytes
+        
+    Returns:
+        The parsed Python object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 class NileApiClient:
     """Client for making requests to Nile API endpoints."""
     
@@ -24,10 +103,19 @@ class NileApiClient:
             api_key: The API key to use for authentication
             tenant_id: The tenant ID to use for querying data
         """
-        self.url = "https://u1.nile-global.cloud"  # Default URL for Nile API
+        self.url = f"https://{NILE_API_HOST}"  # Default URL for Nile API
         self.api_token = api_key
         self.tenant_id = tenant_id
-        self.http = urllib3.PoolManager()
+        self.http = HTTP_POOL
+        
+        # The credentials are fixed for the client's lifetime, so build the headers once
+        self.headers = {
+            'Authorization': f'Bearer {api_key}',
+            'x-tenant-id': tenant_id,
+            'Accept': 'application/json',
+            # response.read() decodes the content encoding, so it always returns the plain JSON
+            'Accept-Encoding': 'gzip, deflate'
+        }
         
     def validate_credentials(self) -> None:
         """
@@ -49,19 +137,15 @@ class NileApiClient:
         Returns:
             Headers dictionary
         """
-        return {
-            'Authorization': f'Bearer {self.api_token}',
-            'x-tenant-id': self.tenant_id
-        }
+        return self.headers
     
-    def make_request(self, endpoint: str, method: str = "GET", max_retries: int = 5) -> Dict[str, Any]:
+    def make_request(self, endpoint: str, method: str = "GET") -> Dict[str, Any]:
         """
         Make a request to the Nile API with retry logic.
         
         Args:
             endpoint: The API endpoint to call
             method: The HTTP method to use
-            max_retries: Maximum number of retries for 401 responses
             
         Returns:
             Parsed JSON response
@@ -74,46 +158,31 @@ class NileApiClient:
         headers = self.get_headers()
         final_url = f"{self.url}{endpoint}"
         
-        logger.info(f"Request URL: {final_url}")
-        logger.info(f"Request headers: {headers}")
+        logger.info("Request URL: %s", final_url)
+        logger.info("Request headers: %s", headers)
         
-        # Add retry logic for 401 responses
-        retry_count = 0
-        response = None
+        # Retries for network errors and retryable statuses, including 401s, are handled
+        # by RETRY_POLICY; the last response is returned once they run out
+        response = self.http.request(
+            method, 
+            endpoint, 
+            headers=headers,
+            timeout=30.0,  # 30 second timeout
+            retries=RETRY_POLICY,
+            preload_content=False
+        )
         
-        while retry_count <= max_retries:
-            if retry_count > 0:
-                # Calculate random backoff time between 1 and 5 seconds
-                backoff = random.uniform(1, 5)
-                logger.info(f"Retry {retry_count}/{max_retries} after {backoff:.2f} seconds backoff")
-                time.sleep(backoff)
-            
-            # Add timeout to the request
-            response = self.http.request(
-                method, 
-                final_url, 
-                headers=headers,
-                timeout=30.0,  # 30 second timeout
-                retries=3      # Retry up to 3 times for network issues
-            )
-            
-            logger.info(f"Response received. Status: {response.status}")
-            
-            # If response is 401, retry with backoff
-            if response.status == 401:
-                retry_count += 1
-                if retry_count <= max_retries:
-                    logger.warning(f"Received 401 Unauthorized, will retry ({retry_count}/{max_retries})")
-                    continue
-                else:
-                    logger.error(f"Received 401 Unauthorized, max retries ({max_retries}) exceeded")
-            else:
-                # For non-401 responses, break the loop
-                break
+        logger.info("Response received. Status: %s", response.status)
+        
+        # Read the body ourselves and hand the connection straight back to the pool
+        try:
+            response_bytes = response.read()
+        finally:
+            response.release_conn()
         
-        # Try to decode the response data
-        response_data = response.data.decode('utf-8')
-        logger.info(f"Response data preview: {response_data[:200]}...")  # Print first 200 chars
+        # Parse the raw bytes; only the preview used in log and error messages is decoded
+        response_data = response_bytes[:1000].decode('utf-8', 'replace')
+        logger.info("Response data preview: %s...", response_data[:200])  # Print first 200 chars
         
         if response.status != 200:
             logger.error(f"HTTP error: {response.status}")
@@ -121,7 +190,7 @@ class NileApiClient:
             raise Exception(f"HTTP error occurred: status code {response.status}, response: {response_data[:500]}")
 
         content_type = response.headers.get('Content-Type', '')
-        logger.info(f"Content-Type: {content_type}")
+        logger.info("Content-Type: %s", content_type)
         
         if "application/json" not in content_type:
             logger.error(f"Non-JSON response: {content_type}")
@@ -130,11 +199,11 @@ class NileApiClient:
 
         logger.info("Parsing JSON response")
         try:
-            data = json.loads(response_data)
-            logger.info(f"Data type: {type(data)}")
+            data = json_loads(response_bytes)
+            logger.info("Data type: %s", type(data))
             return data
         except json.JSONDecodeError as err:
-            logger.error(f"JSON decode error: {err}", exc_info=True)
+            logger.error(f"JSON decode error: {err}")
             logger.error(f"Raw response data: {response_data[:1000]}")
             raise Exception(f"Error decoding JSON response: {err}. Raw data: {response_data[:500]}") from err
     
@@ -153,17 +222,17 @@ class NileApiClient:
         # Check if 'data' key exists in the response
         if 'data' not in data:
             logger.error("No 'data' key in response")
-            logger.error(f"Response keys: {list(data.keys())}")
+            logger.error("Response keys: %s", data.keys())
             raise Exception(f"Unexpected response format: 'data' key missing. Response: {data}")
             
         # Check if 'content' key exists in the 'data' object
         if 'content' not in data['data']:
             logger.error("No 'content' key in data object")
-            logger.error(f"Data keys: {list(data['data'].keys())}")
+            logger.error("Data keys: %s", data['data'].keys())
             raise Exception(f"Unexpected response format: 'content' key missing. Response: {data['data']}")
             
         result = data['data']['content']
-        logger.info(f"Found {len(result)} segments in response")
+        logger.info("Found %d segments in response", len(result))
 
         if not result:
             logger.warning("No segments found in response")
@@ -171,33 +240,49 @@ class NileApiClient:
             
         return result
     
-    def get_sites(self) -> List[Dict[str, Any]]:
+    def get_content(self, endpoint: str, label: str) -> List[Dict[str, Any]]:
         """
-        Get sites from the Nile API.
+        Get the 'content' list of a Nile API listing endpoint.
         
+        Args:
+            endpoint: The API endpoint to call
+            label: The plural name of the listed objects, used in log and error messages
+            
         Returns:
-            List of site objects
+            List of objects
             
         Raises:
-            Exception: If the request fails
+            Exception: If the request fails or the listing is empty
         """
-        data = self.make_request("/api/v1/sites")
+        data = self.make_request(endpoint)
         
         # Check if 'content' key exists in the response
         if 'content' not in data:
             logger.error("No 'content' key in response")
-            logger.error(f"Response keys: {list(data.keys())}")
+            logger.error("Response keys: %s", data.keys())
             raise Exception(f"Unexpected response format: 'content' key missing. Response: {data}")
             
         result = data['content']
-        logger.info(f"Found {len(result)} sites in response")
+        logger.info("Found %d %s in response", len(result), label)
         
         if not result:
-            logger.warning("No sites found in response")
-            raise Exception("No sites found for this tenant.")
+            logger.warning(f"No {label} found in response")
+            raise Exception(f"No {label} found for this tenant.")
             
         return result
     
+    def get_sites(self) -> List[Dict[str, Any]]:
+        """
+        Get sites from the Nile API.
+        
+        Returns:
+            List of site objects
+            
+        Raises:
+            Exception: If the request fails
+        """
+        return self.get_content("/api/v1/sites", "sites")
+    
     def get_buildings(self) -> List[Dict[str, Any]]:
         """
         Get buildings from the Nile API.
@@ -208,22 +293,7 @@ class NileApiClient:
         Raises:
             Exception: If the request fails
         """
-        data = self.make_request("/api/v1/buildings")
-        
-        # Check if 'content' key exists in the response
-        if 'content' not in data:
-            logger.error("No 'content' key in response")
-            logger.error(f"Response keys: {list(data.keys())}")
-            raise Exception(f"Unexpected response format: 'content' key missing. Response: {data}")
-            
-        result = data['content']
-        logger.info(f"Found {len(result)} buildings in response")
-        
-        if not result:
-            logger.warning("No buildings found in response")
-            raise Exception("No buildings found for this tenant.")
-            
-        return result
+        return self.get_content("/api/v1/buildings", "buildings")
     
     def get_floors(self) -> List[Dict[str, Any]]:
         """
@@ -235,22 +305,7 @@ class NileApiClient:
         Raises:
             Exception: If the request fails
         """
-        data = self.make_request("/api/v1/floors")
-        
-        # Check if 'content' key exists in the response
-        if 'content' not in data:
-            logger.error("No 'content' key in response")
-            logger.error(f"Response keys: {list(data.keys())}")
-            raise Exception(f"Unexpected response format: 'content' key missing. Response: {data}")
-            
-        result = data['content']
-        logger.info(f"Found {len(result)} floors in response")
-        
-        if not result:
-            logger.warning("No floors found in response")
-            raise Exception("No floors found for this tenant.")
-            
-        return result
+        return self.get_content("/api/v1/floors", "floors")
     
     def get_clients(self) -> List[Dict[str, Any]]:
         """
@@ -270,7 +325,7 @@ class NileApiClient:
             logger.error(f"Data content: {data}")
             raise Exception(f"Could not get client data. Data is not a list: {type(data)}, data: {data}")
 
-        logger.info(f"Found {len(data)} clients in response")
+        logger.info("Found %d clients in response", len(data))
         # If no clients are found, return an empty list instead of raising an exception.
         if not data:
             logger.warning("No clients found in response, returning empty list.")
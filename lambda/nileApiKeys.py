@@ -8,8 +8,10 @@ import logging
 from datetime import datetime
 from boto3.dynamodb.conditions import Key
 
-# Set up logger
+# Set up logger, with the log level based on the DEBUG environment variable
 logger = logging.getLogger()
+debug_mode = os.environ.get("DEBUG", "false").lower() == "true"
+logger.setLevel(logging.INFO if debug_mode else logging.WARNING)
 
 # Helper class to convert a DynamoDB item to JSON
 class DecimalEncoder(json.JSONEncoder):
@@ -92,18 +94,6 @@ def lambda_handler(event, context):
     The function expects the user ID to be provided in the request context
     from the Cognito authorizer.
     """
-    # Set up logging
-    import logging
-    import os
-    logger = logging.getLogger()
-    
-    # Set log level based on DEBUG environment variable
-    debug_mode = os.environ.get("DEBUG", "false").lower() == "true"
-    if debug_mode:
-        logger.setLevel(logging.INFO)
-    else:
-        logger.setLevel(logging.WARNING)
-    
     # Log the entire event for debugging
     logger.info(f"Received event: {json.dumps(event, default=str)}")
     logger.info(f"Context: {context}")
@@ -123,7 +113,7 @@ def lambda_handler(event, context):
                 'body': json.dumps({'message': 'CORS preflight request successful'})
             }
             
-        logger.info(f"Event keys: {list(event.keys()) if isinstance(event, dict) else 'Event is not a dict'}")
+        logger.info("Event keys: %s", event.keys() if isinstance(event, dict) else 'Event is not a dict')
         
         # Get HTTP method
         http_method = event.get('requestContext', {}).get('http', {}).get('method')
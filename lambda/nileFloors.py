@@ -26,6 +26,10 @@ CORS_HEADERS = {
 # DynamoDB table name
 TENANT_TABLE_NAME = 'tenant'
 
+# DynamoDB resources are created once per container and shared across warm invocations
+DYNAMODB = boto3.resource('dynamodb')
+TENANT_TABLE = DYNAMODB.Table(TENANT_TABLE_NAME)
+
 
 class NileBaseHandler:
     """Base class for all Nile API Lambda handlers."""
@@ -38,9 +42,8 @@ class NileBaseHandler:
             api_key: The API key to use for authentication
             tenant_id: The tenant ID to use for querying data
         """
-        # Initialize AWS resources
-        dynamodb = boto3.resource('dynamodb')
-        self.table = dynamodb.Table(TENANT_TABLE_NAME)
+        # Reuse the module-level DynamoDB table
+        self.table = TENANT_TABLE
         
         # Store API key and tenant ID
         self.api_key = api_key
@@ -309,9 +312,10 @@ def standard_lambda_handler(event: Dict[str, Any], context: Any, handler_class:
     Returns:
         API Gateway response
     """
-    # Log the entire event for debugging
-    logger.info(f"Received event: {json.dumps(event, default=str)}")
-    logger.info(f"Context: {context}")
+    # Log the entire event for debugging, without serializing it when INFO logging is off
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Received event: %s", json.dumps(event, default=str))
+        logger.info("Context: %s", context)
     
     # Check if this is a preflight request (OPTIONS)
     if event.get('requestContext', {}).get('http', {}).get('method') == 'OPTIONS' or \
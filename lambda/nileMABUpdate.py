@@ -110,7 +110,7 @@ class MabUpdateHandler:
 # Helper function for PATCH operation to update MAC auth state
 def update_mac_auth_state(client_id: str, mac_address: str, segment_id: str, state: str, description: str, event_headers: Dict[str, str]) -> Dict[str, Any]:
     logger.info(f"Initiating MAC auth update for clientId: {client_id}, macAddress: {mac_address}, state: {state}, description: '{description}'")
-    logger.info(f"Received event headers for PATCH: {json.dumps(event_headers)}")
+    logger.info("Received event headers for PATCH: %s", event_headers)
 
     # Extract the API key from the incoming event's headers
     # Note: API Gateway v2.0 payload lowercases all header names.
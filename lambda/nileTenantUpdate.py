@@ -2,15 +2,27 @@
 Lambda function to update tenant data from the Nile API.
 """
 
+import functools
+import hashlib
 import json
 import time
 import boto3
 import logging
 import os
-from typing import Dict, Any, List, Tuple, Optional
+import urllib3
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, Dict, Any, List, Tuple, Optional
+
+from boto3.dynamodb.table import BatchWriter
+from botocore.config import Config
 
 from api_utils import NileApiClient
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib json module
+    orjson = None
+
 # Configure logging
 logger = logging.getLogger()
 debug_mode = os.environ.get("DEBUG", "false").lower() == "true"
@@ -24,6 +36,113 @@ CORS_HEADERS = {
     'Access-Control-Allow-Methods': 'GET,OPTIONS'
 }
 
+# Static response for CORS preflight requests, serialized once at import time
+PREFLIGHT_RESPONSE = {
+    'statusCode': 200,
+    'headers': CORS_HEADERS,
+    'body': json.dumps({'message': 'CORS preflight request successful'})
+}
+
+# Static response for keep-warm pings, which only need the container to be initialized
+WARMER_RESPONSE = {
+    'statusCode': 200,
+    'headers': CORS_HEADERS,
+    'body': json.dumps({'message': 'warm'})
+}
+
+# DynamoDB table name
+TENANT_TABLE_NAME = 'tenant'
+
+# DynamoDB resources are created once per container and shared across warm invocations.
+# Adaptive retries back off client-side if the concurrent updaters get throttled.
+# The updater threads go through the resource's client, which is thread safe and still
+# converts between DynamoDB's typed format and plain Python values; resource instances
+# such as Table are not thread safe.
+DYNAMODB = boto3.resource('dynamodb', config=Config(retries={'mode': 'adaptive'}))
+DYNAMODB_CLIENT = DYNAMODB.meta.client
+
+# Key condition for the stored hash queries, given as a string so no condition
+# expression builder state is shared between threads
+PREFIX_KEY_CONDITION = 'pk = :pk AND begins_with(sk, :prefix)'
+
+# Worker threads for the concurrent updaters, created once per container
+UPDATE_EXECUTOR = ThreadPoolExecutor(max_workers=4)
+
+# Nile API responses kept per container across warm invocations, keyed by
+# (API key, tenant ID, fetch method) so a cached response is only served to the
+# credentials the Nile API accepted, and holding (expiry time, objects).
+# API_CACHE_TTL is in seconds; caching is off by default, since each invocation is
+# an explicit request to refresh the tenant's data.
+API_CACHE: Dict[Tuple[Optional[str], Optional[str], str], Tuple[float, List[Dict[str, Any]]]] = {}
+API_CACHE_TTL = float(os.environ.get("API_CACHE_TTL", "0"))
+API_CACHE_MAX_ENTRIES = 256
+
+# Content hashes of the stored records, kept per container so warm invocations can
+# skip unchanged writes without re-reading them. Keyed by (tenant ID, sort key
+# prefix) and holding (expiry time, hashes by sort key). Entries are reloaded from
+# DynamoDB after STORED_HASH_CACHE_TTL seconds to pick up writes by other containers.
+STORED_HASH_CACHE: Dict[Tuple[Optional[str], str], Tuple[float, Dict[str, str]]] = {}
+STORED_HASH_CACHE_TTL = 300
+STORED_HASH_CACHE_MAX_ENTRIES = 256
+
+# Keys each Nile API object must have to be stored
+SEGMENT_REQUIRED_KEYS = frozenset({"tenantId", "id", "instanceName", "version"})
+SITE_REQUIRED_KEYS = frozenset({"tenantId", "id", "name", "address"})
+BUILDING_REQUIRED_KEYS = frozenset({"tenantId", "siteId", "id", "name", "address"})
+FLOOR_REQUIRED_KEYS = frozenset({"tenantId", "siteId", "buildingId", "id", "name", "number"})
+
+# Attribute holding a hash of each record's content, used to skip unchanged writes
+CONTENT_HASH_ATTRIBUTE = 'contentHash'
+
+
+def json_dumps(data: Any) -> str:
+    """
+    Serialize an object to a JSON string, using orjson when it is available.
+    
+    Args:
+        data: The object to serialize
+        
+    Returns:
+        The JSON document as a str
+    """
+    if orjson is not None:
+        return orjson.dumps(data, default=str).decode('utf-8')
+    return json.dumps(data, default=str)
+
+
+def content_hash(data: Dict[str, Any]) -> str:
+    """
+    Compute a stable hash of a record's content.
+    
+    Args:
+        data: The record to hash
+        
+    Returns:
+        The hex digest of the record's canonical JSON form
+    """
+    canonical = json.dumps(data, sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+@functools.lru_cache(maxsize=32)
+def get_api_client(api_key: Optional[str], tenant_id: Optional[str]) -> NileApiClient:
+    """
+    Get a Nile API client for the given credentials.
+    
+    Clients are cached per container so warm invocations reuse them, along with their
+    prebuilt request headers. Every client shares api_utils' module-level connection
+    pool, so the open TLS connections to the Nile API survive credential changes.
+    
+    Args:
+        api_key: The API key to use for authentication
+        tenant_id: The tenant ID to use for querying data
+        
+    Returns:
+        The Nile API client
+    """
+    return NileApiClient(api_key=api_key, tenant_id=tenant_id)
+
+
 class TenantUpdateHandler:
     """Handler for updating tenant data from the Nile API."""
 
@@ -35,12 +154,123 @@ class TenantUpdateHandler:
             api_key: The API key to use for authentication
             tenant_id: The tenant ID to use for querying data
         """
-        # Initialize the Nile API client
-        self.api_client = NileApiClient(api_key=api_key, tenant_id=tenant_id)
+        # Reuse the Nile API client for these credentials from earlier warm invocations
+        self.api_client = get_api_client(api_key, tenant_id)
+    
+    def fetch_with_retry(self, fetch: Callable[[], List[Dict[str, Any]]], max_retries: int = 5) -> List[Dict[str, Any]]:
+        """
+        Call a Nile API fetch method, retrying failures with exponential backoff.
+        
+        Results are served from API_CACHE while they are fresh.
+        
+        Args:
+            fetch: The API client method to call
+            max_retries: Maximum number of attempts
+            
+        Returns:
+            The objects returned by the fetch method
+            
+        Raises:
+            Exception: If the last attempt fails
+        """
+        cache_key = (self.api_client.api_token, self.api_client.tenant_id, fetch.__name__)
+        now = time.monotonic()
+        cached = API_CACHE.get(cache_key)
+        if cached and cached[0] > now:
+            return cached[1]
+        
+        for attempt in range(max_retries):
+            try:
+                result = fetch()
+                break
+            except Exception:
+                if attempt == max_retries - 1:
+                    raise
+                time.sleep(2 ** attempt)
         
-        # Initialize DynamoDB
-        dynamodb = boto3.resource('dynamodb')
-        self.table = dynamodb.Table('tenant')
+        if API_CACHE_TTL > 0:
+            API_CACHE.pop(cache_key, None)
+            if len(API_CACHE) >= API_CACHE_MAX_ENTRIES:
+                API_CACHE.pop(next(iter(API_CACHE)), None)
+            API_CACHE[cache_key] = (time.monotonic() + API_CACHE_TTL, result)
+        
+        return result
+    
+    def get_stored_hashes(self, prefix: str) -> Dict[str, str]:
+        """
+        Get the content hashes of the records already stored under a sort key prefix.
+        
+        Hashes are served from STORED_HASH_CACHE while they are fresh, and loaded with
+        a single paginated query otherwise.
+        
+        Args:
+            prefix: The sort key prefix of the record type
+            
+        Returns:
+            Dictionary mapping each stored sort key to its content hash
+        """
+        cache_key = (self.api_client.tenant_id, prefix)
+        now = time.monotonic()
+        cached = STORED_HASH_CACHE.get(cache_key)
+        if cached and cached[0] > now:
+            return cached[1]
+        
+        query_args = {
+            'TableName': TENANT_TABLE_NAME,
+            'KeyConditionExpression': PREFIX_KEY_CONDITION,
+            'ExpressionAttributeValues': {':pk': self.api_client.tenant_id, ':prefix': prefix},
+            'ProjectionExpression': 'sk, ' + CONTENT_HASH_ATTRIBUTE
+        }
+        hashes = {}
+        
+        while True:
+            response = DYNAMODB_CLIENT.query(**query_args)
+            for item in response.get('Items', []):
+                if CONTENT_HASH_ATTRIBUTE in item:
+                    hashes[item['sk']] = item[CONTENT_HASH_ATTRIBUTE]
+            
+            if 'LastEvaluatedKey' not in response:
+                break
+            query_args['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        
+        STORED_HASH_CACHE.pop(cache_key, None)
+        if len(STORED_HASH_CACHE) >= STORED_HASH_CACHE_MAX_ENTRIES:
+            STORED_HASH_CACHE.pop(next(iter(STORED_HASH_CACHE)), None)
+        STORED_HASH_CACHE[cache_key] = (now + STORED_HASH_CACHE_TTL, hashes)
+        
+        return hashes
+    
+    def write_changed_items(self, prefix: str, items: List[Dict[str, Any]]) -> int:
+        """
+        Write records to DynamoDB, skipping those whose stored content is unchanged.
+        
+        Each record is hashed and compared against the hashes already stored under the
+        prefix. Changed records are written in batches, with the hash stored alongside
+        them; the records passed in are left unmodified.
+        
+        Args:
+            prefix: The sort key prefix of the record type
+            items: The records to store
+            
+        Returns:
+            The number of records written
+        """
+        stored_hashes = self.get_stored_hashes(prefix)
+        changed = []
+        
+        with BatchWriter(TENANT_TABLE_NAME, DYNAMODB_CLIENT, overwrite_by_pkeys=['pk', 'sk']) as batch:
+            for data in items:
+                digest = content_hash(data)
+                if stored_hashes.get(data['sk']) != digest:
+                    batch.put_item(Item={**data, CONTENT_HASH_ATTRIBUTE: digest})
+                    changed.append((data['sk'], digest))
+        
+        # The batch has been flushed, so the cached hashes can reflect the new records
+        for sk, digest in changed:
+            stored_hashes[sk] = digest
+        
+        logger.debug("Wrote %d of %d %s records", len(changed), len(items), prefix)
+        return len(changed)
     
     def update_segments(self) -> List[Dict[str, Any]]:
         """
@@ -53,24 +283,13 @@ class TenantUpdateHandler:
             Exception: If the update fails
         """
         # Get segments from the Nile API
-        max_retries = 5
-        for attempt in range(max_retries):
-            try:
-                segments_data = self.api_client.get_segments()
-                break
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    time.sleep(2 ** attempt)
-                else:
-                    raise e
+        segments_data = self.fetch_with_retry(self.api_client.get_segments)
         
         # Process and store segments in DynamoDB
         segments = []
         for seg in segments_data:
             # Check if required keys exist
-            required_keys = ["tenantId", "id", "instanceName", "version"]
-            missing_keys = [key for key in required_keys if key not in seg]
-            if missing_keys:
+            if not SEGMENT_REQUIRED_KEYS <= seg.keys():
                 continue
             
             # Extract segment details
@@ -81,7 +300,7 @@ class TenantUpdateHandler:
             # Create base data object
             data = {
                 "pk": seg["tenantId"],
-                "sk": "SEG#" + seg["id"],
+                "sk": f"SEG#{seg['id']}",
                 "name": seg["instanceName"],
                 "encrypted": seg.get("encrypted", True),
                 "version": seg["version"],
@@ -135,10 +354,11 @@ class TenantUpdateHandler:
                     "zoneSettings": linked_settings.get("zoneSettings", [])
                 }
             
-            # Store in DynamoDB
-            self.table.put_item(Item=data)
             segments.append(data)
         
+        # Store in DynamoDB, skipping records that haven't changed
+        self.write_changed_items("SEG#", segments)
+        
         return segments
     
     def update_sites(self) -> List[Dict[str, Any]]:
@@ -152,38 +372,28 @@ class TenantUpdateHandler:
             Exception: If the update fails
         """
         # Get sites from the Nile API
-        max_retries = 5
-        for attempt in range(max_retries):
-            try:
-                sites_data = self.api_client.get_sites()
-                break
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    time.sleep(2 ** attempt)
-                else:
-                    raise e
+        sites_data = self.fetch_with_retry(self.api_client.get_sites)
         
         # Process and store sites in DynamoDB
         sites = []
         for site in sites_data:
             # Check if required keys exist
-            required_keys = ["tenantId", "id", "name", "address"]
-            missing_keys = [key for key in required_keys if key not in site]
-            if missing_keys:
+            if not SITE_REQUIRED_KEYS <= site.keys():
                 continue
             
             data = {
                 "pk": site['tenantId'],
-                "sk": "S#" + site['id'],
+                "sk": f"S#{site['id']}",
                 "name": site['name'],
                 "description": site.get("description", "Unknown"),
                 "address": site['address']
             }
             
-            # Store in DynamoDB
-            self.table.put_item(Item=data)
             sites.append(data)
         
+        # Store in DynamoDB, skipping records that haven't changed
+        self.write_changed_items("S#", sites)
+        
         return sites
     
     def update_buildings(self) -> List[Dict[str, Any]]:
@@ -197,38 +407,28 @@ class TenantUpdateHandler:
             Exception: If the update fails
         """
         # Get buildings from the Nile API
-        max_retries = 5
-        for attempt in range(max_retries):
-            try:
-                buildings_data = self.api_client.get_buildings()
-                break
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    time.sleep(2 ** attempt)
-                else:
-                    raise e
+        buildings_data = self.fetch_with_retry(self.api_client.get_buildings)
         
         # Process and store buildings in DynamoDB
         buildings = []
         for bldg in buildings_data:
             # Check if required keys exist
-            required_keys = ["tenantId", "siteId", "id", "name", "address"]
-            missing_keys = [key for key in required_keys if key not in bldg]
-            if missing_keys:
+            if not BUILDING_REQUIRED_KEYS <= bldg.keys():
                 continue
             
             data = {
                 "pk": bldg["tenantId"],
-                "sk": "B#" + bldg["siteId"] + "#" + bldg['id'],
+                "sk": f"B#{bldg['siteId']}#{bldg['id']}",
                 "name": bldg["name"],
                 "description": bldg.get("description", "Unknown"),
                 "address": bldg["address"]
             }
             
-            # Store in DynamoDB
-            self.table.put_item(Item=data)
             buildings.append(data)
         
+        # Store in DynamoDB, skipping records that haven't changed
+        self.write_changed_items("B#", buildings)
+        
         return buildings
     
     def update_floors(self) -> List[Dict[str, Any]]:
@@ -242,38 +442,28 @@ class TenantUpdateHandler:
             Exception: If the update fails
         """
         # Get floors from the Nile API
-        max_retries = 5
-        for attempt in range(max_retries):
-            try:
-                floors_data = self.api_client.get_floors()
-                break
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    time.sleep(2 ** attempt)
-                else:
-                    raise e
+        floors_data = self.fetch_with_retry(self.api_client.get_floors)
         
         # Process and store floors in DynamoDB
         floors = []
         for floor in floors_data:
             # Check if required keys exist
-            required_keys = ["tenantId", "siteId", "buildingId", "id", "name", "number"]
-            missing_keys = [key for key in required_keys if key not in floor]
-            if missing_keys:
+            if not FLOOR_REQUIRED_KEYS <= floor.keys():
                 continue
             
             data = {
                 "pk": floor["tenantId"],
-                "sk": "F#" + floor["siteId"] + "#" + floor["buildingId"] + "#" + floor["id"],
+                "sk": f"F#{floor['siteId']}#{floor['buildingId']}#{floor['id']}",
                 "name": floor["name"],
                 "description": floor.get("description", "Unknown"),
                 "number": floor["number"]
             }
             
-            # Store in DynamoDB
-            self.table.put_item(Item=data)
             floors.append(data)
         
+        # Store in DynamoDB, skipping records that haven't changed
+        self.write_changed_items("F#", floors)
+        
         return floors
     
     def update_tenant_data(self) -> Dict[str, Any]:
@@ -281,18 +471,29 @@ class TenantUpdateHandler:
         Update all tenant data in DynamoDB from the Nile API.
         
         Returns:
-            Dictionary with counts of updated objects
+            Dictionary with the counts and records of the updated objects
             
         Raises:
             Exception: If the update fails
         """
-        # Update all data types
-        segments = self.update_segments()
-        sites = self.update_sites()
-        buildings = self.update_buildings()
-        floors = self.update_floors()
+        # Update all data types concurrently; they are independent and each one is
+        # dominated by Nile API and DynamoDB round trips. The threads share the
+        # thread-safe DynamoDB client, each with its own batch writer, and the
+        # module-level caches, where each updater uses its own keys and touches them
+        # only with single dict operations.
+        updaters = (self.update_segments, self.update_sites, self.update_buildings, self.update_floors)
+        futures = [UPDATE_EXECUTOR.submit(updater) for updater in updaters]
+        
+        # Let every updater finish before reporting, so none is left running while the
+        # container is frozen between invocations
+        wait(futures)
         
-        # Return counts of updated objects
+        segments, sites, buildings, floors = [future.result() for future in futures]
+        logger.info("Updated segments=%d sites=%d buildings=%d floors=%d",
+                    len(segments), len(sites), len(buildings), len(floors))
+        
+        # Return the updated objects along with their counts, so callers don't have to
+        # read them back through the other endpoints
         return {
             "message": "Site(s), Building(s), Floor(s), and Segment(s) updated successfully.",
             "counts": {
@@ -300,7 +501,11 @@ class TenantUpdateHandler:
                 "sites": len(sites),
                 "buildings": len(buildings),
                 "floors": len(floors)
-            }
+            },
+            "segments": segments,
+            "sites": sites,
+            "buildings": buildings,
+            "floors": floors
         }
 
 
@@ -317,31 +522,65 @@ def extract_credentials_from_event(event: Dict[str, Any]) -> Tuple[Optional[str]
     api_key = None
     tenant_id = None
     
-    # Check if the event contains the headers
-    if 'headers' in event:
-        headers = event['headers']
+    # Check if the event contains the headers. Header names are case-insensitive and
+    # API Gateway passes them through with differing case, so match them lowercased.
+    if event.get('headers'):
+        headers = {name.lower(): value for name, value in event['headers'].items()}
         # Extract API key from x-api-key header
         if 'x-api-key' in headers:
             api_key = headers['x-api-key']
         # Fall back to Authorization header if x-api-key is not present
-        elif 'Authorization' in headers:
-            auth_header = headers['Authorization']
-            if auth_header.startswith('Bearer '):
+        elif 'authorization' in headers:
+            auth_header = headers['authorization']
+            # The auth scheme is case-insensitive
+            if auth_header[:7].lower() == 'bearer ':
                 api_key = auth_header[7:]  # Remove 'Bearer ' prefix
         
         # Extract tenant ID from x-tenant-id header
-        if 'x-tenant-id' in headers:
-            tenant_id = headers['x-tenant-id']
+        tenant_id = headers.get('x-tenant-id')
     
-    # Check if the event contains the queryStringParameters
-    if 'queryStringParameters' in event and event['queryStringParameters']:
-        # Extract tenant ID from query parameters if not found in headers
-        if not tenant_id and 'tenantId' in event['queryStringParameters']:
-            tenant_id = event['queryStringParameters']['tenantId']
+    # Extract tenant ID from query parameters if not found in headers
+    query_params = event.get('queryStringParameters')
+    if not tenant_id and query_params:
+        tenant_id = query_params.get('tenantId')
     
     return api_key, tenant_id
 
 
+def get_http_method(event: Dict[str, Any]) -> Optional[str]:
+    """
+    Get the HTTP method of an API Gateway event.
+    
+    HTTP APIs pass it in requestContext.http, REST APIs in httpMethod.
+    
+    Args:
+        event: The Lambda event
+        
+    Returns:
+        The HTTP method, or None if the event doesn't carry one
+    """
+    request_context = event.get('requestContext')
+    if request_context and 'http' in request_context:
+        return request_context['http'].get('method')
+    return event.get('httpMethod')
+
+
+def is_warmer_event(event: Dict[str, Any]) -> bool:
+    """
+    Check whether the event is a keep-warm ping rather than an API request.
+    
+    Pings are recognized from serverless-plugin-warmup's event source, or from a
+    scheduled rule whose input is {"warmer": true}.
+    
+    Args:
+        event: The Lambda event
+        
+    Returns:
+        True if the event is a keep-warm ping
+    """
+    return event.get('source') == 'serverless-plugin-warmup' or event.get('warmer') is True
+
+
 def handle_preflight_request() -> Dict[str, Any]:
     """
     Handle CORS preflight requests.
@@ -349,11 +588,7 @@ def handle_preflight_request() -> Dict[str, Any]:
     Returns:
         API Gateway response
     """
-    return {
-        'statusCode': 200,
-        'headers': CORS_HEADERS,
-        'body': json.dumps({'message': 'CORS preflight request successful'})
-    }
+    return PREFLIGHT_RESPONSE
 
 
 def create_response(status_code: int, body: Any) -> Dict[str, Any]:
@@ -370,21 +605,21 @@ def create_response(status_code: int, body: Any) -> Dict[str, Any]:
     return {
         'statusCode': status_code,
         'headers': CORS_HEADERS,
-        'body': json.dumps(body, default=str)
+        'body': json_dumps(body)
     }
 
 
-def create_error_response(error: Exception, tenant_id: Optional[str], api_key_present: bool, 
-                         event_headers: Dict[str, str], event_query_params: Dict[str, str]) -> Dict[str, Any]:
+def create_error_response(error: Exception, tenant_id: Optional[str], api_key_present: bool) -> Dict[str, Any]:
     """
     Create an error response for API Gateway.
     
+    The request headers and query parameters are deliberately not echoed back, as the
+    headers carry the API key.
+    
     Args:
         error: The exception that occurred
         tenant_id: The tenant ID
         api_key_present: Whether an API key was provided
-        event_headers: The event headers
-        event_query_params: The event query parameters
         
     Returns:
         API Gateway error response
@@ -392,9 +627,7 @@ def create_error_response(error: Exception, tenant_id: Optional[str], api_key_pr
     error_details = {
         'error': str(error),
         'tenant_id': tenant_id,
-        'api_key_present': api_key_present,
-        'event_headers': event_headers,
-        'event_query_params': event_query_params
+        'api_key_present': api_key_present
     }
     
     return create_response(500, error_details)
@@ -414,19 +647,31 @@ def standard_lambda_handler(event: Dict[str, Any], context: Any, handler_class:
     Returns:
         API Gateway response
     """
-    # Log the entire event for debugging
-    logger.info(f"Received event: {json.dumps(event, default=str)}")
-    logger.info(f"Context: {context}")
-    
-    # Check if this is a preflight request (OPTIONS)
-    if event.get('requestContext', {}).get('http', {}).get('method') == 'OPTIONS' or \
-       event.get('httpMethod') == 'OPTIONS':
-        logger.info("Handling preflight request")
+    # Answer preflight requests (OPTIONS) first; they need nothing else from the event
+    if get_http_method(event) == 'OPTIONS':
         return handle_preflight_request()
     
+    # Answer scheduled keep-warm pings without doing any work
+    if is_warmer_event(event):
+        return WARMER_RESPONSE
+    
+    # Log the entire event for debugging, without serializing it when INFO logging is off
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Received event: %s", json.dumps(event, default=str))
+        logger.info("Context: %s", context)
+    
     # Extract API key and tenant ID from the event
     api_key, tenant_id = extract_credentials_from_event(event)
     
+    # Reject requests without credentials before any Nile API call is attempted
+    if not api_key or not tenant_id:
+        return create_response(400, {
+            'error': "API key and tenant ID are required. Please provide them in the x-api-key and x-tenant-id headers.",
+            'tenant_id': tenant_id,
+            'tenant_id_present': bool(tenant_id),
+            'api_key_present': bool(api_key)
+        })
+    
     # Initialize the handler class with the API key and tenant ID
     handler = handler_class(api_key=api_key, tenant_id=tenant_id)
 
@@ -435,13 +680,19 @@ def standard_lambda_handler(event: Dict[str, Any], context: Any, handler_class:
         result = getattr(handler, handler_method_name)()
         return create_response(200, result)
     except Exception as e:
-        logger.error(f"Error in {handler_class.__name__}.{handler_method_name}: {e}")
+        if isinstance(e, urllib3.exceptions.HTTPError):
+            # Network failures and timeouts reaching the Nile API are expected; log them briefly
+            logger.warning("Nile API request failed in %s.%s: %s", handler_class.__name__, handler_method_name, e)
+        elif type(e) is Exception:
+            # Errors raised on purpose carry a descriptive message and don't need a traceback
+            logger.error("Error in %s.%s: %s", handler_class.__name__, handler_method_name, e)
+        else:
+            # Anything else is unexpected, so keep the full traceback
+            logger.exception("Unexpected error in %s.%s", handler_class.__name__, handler_method_name)
         return create_error_response(
             error=e,
             tenant_id=tenant_id,
-            api_key_present=api_key is not None,
-            event_headers=event.get('headers', {}),
-            event_query_params=event.get('queryStringParameters', {})
+            api_key_present=api_key is not None
         )
 
 
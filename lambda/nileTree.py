@@ -2,13 +2,21 @@
 Lambda function to retrieve tenant hierarchy information from DynamoDB.
 """
 
+import functools
 import json
 import logging
 import os
-from typing import Dict, Any, List, Optional, Tuple
+import time
+from collections import defaultdict
+from typing import Dict, Any, List, NamedTuple, Optional, Tuple, Union
 
 import boto3
-from boto3.dynamodb.conditions import Key
+from boto3.dynamodb.types import TypeDeserializer
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib json module
+    orjson = None
 
 # Configure logging
 logger = logging.getLogger()
@@ -23,9 +31,278 @@ CORS_HEADERS = {
     'Access-Control-Allow-Methods': 'GET,OPTIONS'
 }
 
+# Static response for CORS preflight requests, serialized once at import time
+PREFLIGHT_RESPONSE = {
+    'statusCode': 200,
+    'headers': CORS_HEADERS,
+    'body': json.dumps({'message': 'CORS preflight request successful'})
+}
+
+# Per-container cache of assembled tenant trees, keyed by tenant ID and holding
+# (expiry time, tree). TREE_CACHE_TTL is in seconds; caching is off by default, since
+# nothing invalidates a cached tree when the tenant update function writes new data.
+TREE_CACHE: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+TREE_CACHE_TTL = float(os.environ.get("TREE_CACHE_TTL", "0"))
+TREE_CACHE_MAX_ENTRIES = 256
+
 # DynamoDB table name
 TENANT_TABLE_NAME = 'tenant'
 
+# Low-level client for reads, which skips the resource layer's expression builder and
+# per-attribute deserialization
+DYNAMODB_CLIENT = boto3.client('dynamodb')
+TYPE_DESERIALIZER = TypeDeserializer()
+
+# Key condition expression; only the attribute values change between queries
+RANGE_KEY_CONDITION = 'pk = :pk AND sk BETWEEN :first AND :last'
+
+# Attributes read by the tree; name and number are DynamoDB reserved words
+TREE_PROJECTION = 'pk, sk, #name, address, #number'
+TREE_ATTRIBUTE_NAMES = {'#name': 'name', '#number': 'number'}
+
+
+def json_loads(data: Union[str, bytes]) -> Any:
+    """
+    Parse a JSON document, using orjson when it is available.
+    
+    Args:
+        data: The JSON document as a str or bytes
+        
+    Returns:
+        The parsed Python object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(data: Any) -> str:
+    """
+    Serialize an object to a JSON string, using orjson when it is available.
+    
+    Args:
+        data: The object to serialize
+        
+    Returns:
+        The JSON document as a str
+    """
+    if orjson is not None:
+        return orjson.dumps(data, default=str).decode('utf-8')
+    return json.dumps(data, default=str)
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_address_string(address: str) -> Dict[str, Any]:
+    """
+    Parse a JSON-encoded address, memoized across rows and warm invocations.
+    
+    Buildings frequently share an identical address string, so repeated parses are
+    served from the cache. The returned dictionary is shared and must not be mutated.
+    
+    Args:
+        address: The JSON-encoded address
+        
+    Returns:
+        The parsed address
+    """
+    return json_loads(address)
+
+
+def parse_address(address: Any) -> Dict[str, Any]:
+    """
+    Parse an address attribute, which DynamoDB may hold as a JSON string or a map.
+    
+    Args:
+        address: The raw address attribute
+        
+    Returns:
+        The address as a dictionary, or an empty dictionary if it has no usable value
+    """
+    if isinstance(address, dict):
+        return address
+    if not isinstance(address, str) or not address:
+        return {}
+    try:
+        return parse_address_string(address)
+    except ValueError as e:
+        # Both json.JSONDecodeError and orjson.JSONDecodeError subclass ValueError
+        logger.warning("Error parsing address: %s", e)
+        return {}
+
+
+def decode_item(item: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Decode an item returned by the low-level DynamoDB client.
+    
+    String and number attributes are unwrapped directly, with numbers kept in their
+    string form; only maps and other nested types go through TypeDeserializer.
+    
+    Args:
+        item: The item in DynamoDB's typed attribute format
+        
+    Returns:
+        The item as a plain dictionary
+    """
+    row = {}
+    for key, value in item.items():
+        if 'S' in value:
+            row[key] = value['S']
+        elif 'N' in value:
+            row[key] = value['N']
+        else:
+            row[key] = TYPE_DESERIALIZER.deserialize(value)
+    return row
+
+
+class SiteRow(NamedTuple):
+    """A site record read from DynamoDB."""
+    tenantid: str
+    siteid: str
+    name: str
+    address: Any
+
+
+class BuildingRow(NamedTuple):
+    """A building record read from DynamoDB."""
+    tenantid: str
+    siteid: str
+    bldgid: str
+    name: str
+    address: Any
+
+
+class FloorRow(NamedTuple):
+    """A floor record read from DynamoDB."""
+    tenantid: str
+    siteid: str
+    bldgid: str
+    floorid: str
+    name: str
+    number: str
+
+
+# Any record read from DynamoDB for the tree
+TreeRow = Union[SiteRow, BuildingRow, FloorRow]
+
+
+class TenantTreeBuilder:
+    """Assembles the nested tenant hierarchy from site, building, and floor rows."""
+
+    def __init__(self):
+        """
+        Initialize an empty tree along with the ID indexes used to attach child records.
+        
+        The indexes map each ID to the node's position in its parent's list rather than
+        holding a second reference to the node itself.
+        """
+        self.tenant_structure: Dict[str, Any] = {}
+        self.sites_by_id: Dict[str, int] = {}
+        self.bldgs_by_site: Dict[str, Dict[str, int]] = defaultdict(dict)
+
+    def get_site(self, item: TreeRow, address: Any) -> Dict[str, Any]:
+        """
+        Find the site for a row, creating it from the row if it doesn't exist yet.
+        
+        Args:
+            item: A site, building, or floor row
+            address: The raw address to use if the site has to be created
+            
+        Returns:
+            The site node
+        """
+        index = self.sites_by_id.get(item.siteid)
+        if index is not None:
+            return self.tenant_structure["sites"][index]
+        
+        # Init tenant level
+        if not self.tenant_structure:
+            self.tenant_structure["tenantid"] = item.tenantid
+            self.tenant_structure["sites"] = []
+        
+        site = {
+            "siteid": item.siteid,
+            "name": item.name,
+            "address": parse_address(address),
+            "buildings": []
+        }
+        sites = self.tenant_structure["sites"]
+        self.sites_by_id[item.siteid] = len(sites)
+        sites.append(site)
+        return site
+
+    def get_building(self, site: Dict[str, Any], item: Union[BuildingRow, FloorRow], address: Any) -> Dict[str, Any]:
+        """
+        Find the building for a row, creating it from the row if it doesn't exist yet.
+        
+        Args:
+            site: The site node the building belongs to
+            item: A building or floor row
+            address: The raw address to use if the building has to be created
+            
+        Returns:
+            The building node
+        """
+        bldgs_by_id = self.bldgs_by_site[item.siteid]
+        index = bldgs_by_id.get(item.bldgid)
+        if index is not None:
+            return site["buildings"][index]
+        
+        building = {
+            "bldgid": item.bldgid,
+            "name": item.name,
+            "address": parse_address(address),
+            "floors": []
+        }
+        bldgs_by_id[item.bldgid] = len(site["buildings"])
+        site["buildings"].append(building)
+        return building
+
+    def add_sites(self, sites: List[SiteRow]) -> None:
+        """
+        Add site rows to the tree.
+        
+        Args:
+            sites: The site rows
+        """
+        for item in sites:
+            if item.siteid:
+                self.get_site(item, item.address)
+
+    def add_buildings(self, buildings: List[BuildingRow]) -> None:
+        """
+        Add building rows to the tree, under their sites.
+        
+        Args:
+            buildings: The building rows
+        """
+        for item in buildings:
+            if not item.siteid:
+                continue
+            site = self.get_site(item, item.address)
+            if item.bldgid:
+                self.get_building(site, item, item.address)
+
+    def add_floors(self, floors: List[FloorRow]) -> None:
+        """
+        Add floor rows to the tree, under their buildings.
+        
+        Args:
+            floors: The floor rows
+        """
+        for item in floors:
+            if not item.siteid:
+                continue
+            site = self.get_site(item, None)
+            if not item.bldgid:
+                continue
+            building = self.get_building(site, item, None)
+            if item.floorid:
+                building["floors"].append({
+                    "floorid": item.floorid,
+                    "name": item.name,
+                    "number": item.number
+                })
+
 
 class NileBaseHandler:
     """Base class for all Nile API Lambda handlers."""
@@ -38,10 +315,6 @@ class NileBaseHandler:
             api_key: The API key to use for authentication
             tenant_id: The tenant ID to use for querying data
         """
-        # Initialize AWS resources
-        dynamodb = boto3.resource('dynamodb')
-        self.table = dynamodb.Table(TENANT_TABLE_NAME)
-        
         # Store API key and tenant ID
         self.api_key = api_key
         self.tenant_id = tenant_id
@@ -56,13 +329,45 @@ class NileBaseHandler:
         if not self.tenant_id:
             raise Exception("Tenant ID is required. Please provide it in the x-tenant-id header.")
 
-    def query_items(self, prefix: str) -> List[Dict[str, Any]]:
+    def run_query(self, key_condition: str, values: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
-        Query items from DynamoDB with the given prefix.
+        Run a DynamoDB query against the tenant table, following pagination.
+        
+        Only the attributes used to build the tree are returned.
         
         Args:
-            prefix: The prefix to use for the sort key
+            key_condition: The key condition expression
+            values: The expression attribute values, in DynamoDB's typed format
             
+        Returns:
+            List of deserialized items from every page of the query
+        """
+        query_args = {
+            'TableName': TENANT_TABLE_NAME,
+            'KeyConditionExpression': key_condition,
+            'ExpressionAttributeValues': values,
+            'ProjectionExpression': TREE_PROJECTION,
+            'ExpressionAttributeNames': TREE_ATTRIBUTE_NAMES
+        }
+        result = []
+        
+        while True:
+            response = DYNAMODB_CLIENT.query(**query_args)
+            result.extend(decode_item(item) for item in response.get('Items', []))
+            
+            # DynamoDB returns at most 1 MB per page
+            if 'LastEvaluatedKey' not in response:
+                return result
+            query_args['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    def query_tree_items(self) -> List[Dict[str, Any]]:
+        """
+        Query the site, building, and floor items in the tenant's partition.
+        
+        A single sort key range covers all three prefixes: 'B#' sorts first, and
+        'S$' sorts just after every 'S#' key ('$' follows '#') but before the
+        'SEG#' segment items, which the tree doesn't use.
+        
         Returns:
             List of items from DynamoDB
             
@@ -71,30 +376,30 @@ class NileBaseHandler:
         """
         self.validate_tenant_id()
         
-        key_condition = Key('pk').eq(self.tenant_id) & Key('sk').begins_with(prefix)
-        
         try:
-            response = self.table.query(KeyConditionExpression=key_condition)
-            result = response.get('Items', [])
+            result = self.run_query(
+                RANGE_KEY_CONDITION,
+                {':pk': {'S': self.tenant_id}, ':first': {'S': 'B#'}, ':last': {'S': 'S$'}}
+            )
             
             if not result:
-                logger.warning(f"No items found with prefix {prefix} for tenant {self.tenant_id}")
+                logger.warning(f"No items found for tenant {self.tenant_id}")
                 
             return result
         except Exception as err:
-            logger.error(f"Error querying items with prefix {prefix}: {err}")
+            logger.error(f"Error querying items for tenant {self.tenant_id}: {err}")
             raise Exception(f"Error querying items: {err}") from err
 
 
 class NileTreeHandler(NileBaseHandler):
     """Handler for tenant hierarchy operations."""
 
-    def transform_hierarchy(self, raw_data: List[List[Dict[str, Any]]]) -> Dict[str, Any]:
+    def transform_hierarchy(self, raw_data: List[List[TreeRow]]) -> Dict[str, Any]:
         """
         Transform the raw data into a hierarchical structure.
         
         Args:
-            raw_data: A list of lists containing sites, buildings, and floors
+            raw_data: A list of lists containing SiteRow, BuildingRow, and FloorRow records
             
         Returns:
             A hierarchical structure of the tenant's data
@@ -103,90 +408,26 @@ class NileTreeHandler(NileBaseHandler):
             Exception: If there's an error transforming the hierarchy
         """
         try:
-            tenant_structure = {}
-            
-            # If raw_data is empty or doesn't contain any items, return a minimal structure
-            if not raw_data or all(not group for group in raw_data):
+            # Without any sites there is nothing to attach buildings or floors to,
+            # so return a minimal structure
+            if not raw_data or not raw_data[0]:
                 return {"tenantid": self.tenant_id, "sites": []}
             
-            for group in raw_data:
-                for item in group:
-                    # Skip items that don't have the required fields
-                    if "tenantid" not in item:
-                        continue
-                        
-                    tenant_id = item["tenantid"]
-                    site_id = item.get("siteid")
-                    bldg_id = item.get("bldgid")
-                    floor_id = item.get("floorid")
-                    
-                    # Skip items that don't have a site ID
-                    if not site_id:
-                        continue
-
-                    # Init tenant level
-                    if "tenantid" not in tenant_structure:
-                        tenant_structure["tenantid"] = tenant_id
-                        tenant_structure["sites"] = []
-
-                    # Find or create site
-                    site = next((s for s in tenant_structure["sites"] if s["siteid"] == site_id), None)
-                    if not site:
-                        try:
-                            address_data = {}
-                            if "address" in item:
-                                if isinstance(item["address"], str):
-                                    address_data = json.loads(item["address"])
-                                elif isinstance(item["address"], dict):
-                                    address_data = item["address"]
-                        except Exception as e:
-                            print(f"Error parsing address: {e}")
-                            address_data = {}
-                            
-                        site = {
-                            "siteid": site_id,
-                            "name": item.get("name", ""),
-                            "address": address_data,
-                            "buildings": []
-                        }
-                        tenant_structure["sites"].append(site)
-
-                    # If building info is present
-                    if bldg_id:
-                        building = next((b for b in site["buildings"] if b["bldgid"] == bldg_id), None)
-                        if not building:
-                            try:
-                                address_data = {}
-                                if "address" in item:
-                                    if isinstance(item["address"], str):
-                                        address_data = json.loads(item["address"])
-                                    elif isinstance(item["address"], dict):
-                                        address_data = item["address"]
-                            except Exception as e:
-                                print(f"Error parsing address: {e}")
-                                address_data = {}
-                                
-                            building = {
-                                "bldgid": bldg_id,
-                                "name": item.get("name", ""),
-                                "address": address_data,
-                                "floors": []
-                            }
-                            site["buildings"].append(building)
-
-                        # If floor info is present
-                        if floor_id:
-                            floor = {
-                                "floorid": floor_id,
-                                "name": item.get("name", ""),
-                                "number": item.get("number", "")
-                            }
-                            building["floors"].append(floor)
+            sites, buildings, floors = raw_data
             
-            return tenant_structure
+            # Add each record type in its own pass so every loop handles a single row shape,
+            # skipping a pass when the previous one left nothing to attach it to
+            builder = TenantTreeBuilder()
+            builder.add_sites(sites)
+            if builder.sites_by_id:
+                builder.add_buildings(buildings)
+            if builder.bldgs_by_site:
+                builder.add_floors(floors)
+            
+            return builder.tenant_structure
             
         except Exception as e:
-            print(f"Error in transform_hierarchy: {e}")
+            logger.warning("Error in transform_hierarchy: %s", e)
             # Return a minimal structure if there's an error
             return {"tenantid": self.tenant_id, "sites": [], "error": str(e)}
 
@@ -200,80 +441,52 @@ class NileTreeHandler(NileBaseHandler):
         Raises:
             Exception: If no data exists or if there's an error retrieving it
         """
-        # Initialize variables to empty lists in case any of the queries fail
+        # Serve the tree from the per-container cache while it is fresh
+        now = time.monotonic()
+        cached = TREE_CACHE.get(self.tenant_id)
+        if cached and cached[0] > now:
+            return cached[1]
+        
+        # Fetch every tree item in one query and build each row as it is dispatched on
+        # its sort key prefix; a failure keeps the rows built so far
         sites = []
         buildings = []
         floors = []
-        segments = []
-        
-        # Get sites
+        # Bind the appends once rather than looking them up for every row
+        add_site, add_building, add_floor = sites.append, buildings.append, floors.append
         try:
-            sites_result = self.query_items("S#")
-            
-            if sites_result:  # Only process if we have results
-                for site in sites_result:
-                    data = {
-                        "tenantid": site['pk'],
-                        "siteid": site['sk'].split('#')[1],
-                        "name": site['name'],
-                        "address": site['address']
-                    }
-                    sites.append(data)
+            for item in self.query_tree_items():
+                sk = item['sk']
+                if sk.startswith('S#'):
+                    _, site_id = sk.split('#', 1)
+                    add_site(SiteRow(
+                        tenantid=item['pk'],
+                        siteid=site_id,
+                        name=item['name'],
+                        address=item['address']
+                    ))
+                elif sk.startswith('B#'):
+                    _, site_id, bldg_id = sk.split('#', 2)
+                    add_building(BuildingRow(
+                        tenantid=item['pk'],
+                        siteid=site_id,
+                        bldgid=bldg_id,
+                        name=item['name'],
+                        address=item['address']
+                    ))
+                elif sk.startswith('F#'):
+                    _, site_id, bldg_id, floor_id = sk.split('#', 3)
+                    add_floor(FloorRow(
+                        tenantid=item['pk'],
+                        siteid=site_id,
+                        bldgid=bldg_id,
+                        floorid=floor_id,
+                        name=item['name'],
+                        number=str(item['number'])
+                    ))
         except Exception as err:
-            print(f"Error retrieving sites: {err}")
-            # Continue with empty sites list rather than failing completely
-        
-        # Get buildings
-        try:
-            bldgs_result = self.query_items("B#")
-            
-            if bldgs_result:  # Only process if we have results
-                for bldg in bldgs_result:
-                    data = {
-                        "tenantid": bldg['pk'],
-                        "siteid": bldg['sk'].split('#')[1],
-                        "bldgid": bldg['sk'].split('#')[2],
-                        "name": bldg['name'],
-                        "address": bldg['address']
-                    }
-                    buildings.append(data)
-        except Exception as err:
-            print(f"Error retrieving buildings: {err}")
-            # Continue with empty buildings list rather than failing completely
-        
-        # Get floors
-        try:
-            floors_result = self.query_items("F#")
-            
-            if floors_result:  # Only process if we have results
-                for floor in floors_result:
-                    data = {
-                        "tenantid": floor['pk'],
-                        "siteid": floor['sk'].split('#')[1],
-                        "bldgid": floor['sk'].split('#')[2],
-                        "floorid": floor['sk'].split('#')[3],
-                        "name": floor['name'],
-                        "number": str(floor['number'])
-                    }
-                    floors.append(data)
-        except Exception as err:
-            print(f"Error retrieving floors: {err}")
-            # Continue with empty floors list rather than failing completely
-        
-        # Get segments
-        try:
-            segments_result = self.query_items("SEG#")
-            
-            if segments_result:  # Only process if we have results
-                for seg in segments_result:
-                    data = {
-                        "tenantid": seg['pk'],
-                        "segment": seg['name']
-                    }
-                    segments.append(data)
-        except Exception as err:
-            print(f"Error retrieving segments: {err}")
-            # Continue with empty segments list rather than failing completely
+            logger.warning("Error retrieving tenant items: %s", err)
+            # Continue with the rows built so far rather than failing completely
         
         # Check if we have any data at all
         if not sites and not buildings and not floors:
@@ -283,9 +496,17 @@ class NileTreeHandler(NileBaseHandler):
         
         try:
             tenant_tree = self.transform_hierarchy(raw_data)
-            return tenant_tree
         except Exception as err:
             raise Exception(f"Error transforming hierarchy: {err}") from err
+        
+        # Only cache complete trees; drop the oldest entry once the cache is full
+        if TREE_CACHE_TTL > 0 and "error" not in tenant_tree:
+            TREE_CACHE.pop(self.tenant_id, None)
+            if len(TREE_CACHE) >= TREE_CACHE_MAX_ENTRIES:
+                TREE_CACHE.pop(next(iter(TREE_CACHE)))
+            TREE_CACHE[self.tenant_id] = (now + TREE_CACHE_TTL, tenant_tree)
+        
+        return tenant_tree
 
 
 def extract_credentials_from_event(event: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
@@ -333,11 +554,7 @@ def handle_preflight_request() -> Dict[str, Any]:
     Returns:
         API Gateway response
     """
-    return {
-        'statusCode': 200,
-        'headers': CORS_HEADERS,
-        'body': json.dumps({'message': 'CORS preflight request successful'})
-    }
+    return PREFLIGHT_RESPONSE
 
 
 def create_response(status_code: int, body: Any) -> Dict[str, Any]:
@@ -354,7 +571,8 @@ def create_response(status_code: int, body: Any) -> Dict[str, Any]:
     return {
         'statusCode': status_code,
         'headers': CORS_HEADERS,
-        'body': json.dumps(body, default=str)
+        'body': json_dumps(body),
+        'isBase64Encoded': False
     }
 
 
@@ -398,9 +616,10 @@ def standard_lambda_handler(event: Dict[str, Any], context: Any, handler_class:
     Returns:
         API Gateway response
     """
-    # Log the entire event for debugging
-    logger.info(f"Received event: {json.dumps(event, default=str)}")
-    logger.info(f"Context: {context}")
+    # Log the entire event for debugging, without serializing it when INFO logging is off
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Received event: %s", json.dumps(event, default=str))
+        logger.info("Context: %s", context)
     
     # Check if this is a preflight request (OPTIONS)
     if event.get('requestContext', {}).get('http', {}).get('method') == 'OPTIONS' or \